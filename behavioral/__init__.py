@@ -0,0 +1,20 @@
+'''
+Behavioral design patterns.
+
+Each submodule is imported the first time it is accessed as an attribute,
+e.g. `behavioral.observer`, so importing the package itself is cheap.
+'''
+
+__all__ = [
+    "chainofreponsibility", "command", "liftsimulation", "mediator", "observer",
+    "sharedmemoryobserver", "state", "templatemethod", "topicobserver",
+]
+
+def __getattr__(name):
+    if name in __all__:
+        from importlib import import_module
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
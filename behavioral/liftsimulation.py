@@ -0,0 +1,152 @@
+import heapq
+import random
+import time
+from collections import defaultdict
+
+from .state import IDLE, MOVING, LOOKScheduler, Lift, SCANScheduler
+
+# Event kinds
+HALL_CALL = 0
+ARRIVAL = 1
+
+# Group dispatcher
+class GroupDispatcher:
+    """
+    Assigns hall calls to one lift in a group of lifts sharing a shaft bank.
+
+    The cost of a lift is its distance to the calling floor plus a penalty
+    per floor already queued for it, so busy lifts are passed over.
+    """
+
+    def __init__(self, lifts, queue_penalty=2):
+        self.lifts = lifts
+        self.queue_penalty = queue_penalty
+
+    def assign(self, floor):
+        def cost(lift):
+            queued = len(lift.scheduler) + (lift.state is MOVING)
+            return abs(lift.current_floor - floor) + self.queue_penalty * queued
+        return min(self.lifts, key=cost)
+
+# Discrete-event simulation
+class LiftSimulation:
+    """
+    Drives `groups` independent lift banks from a single heap of timed events.
+
+    Each bank receives hall calls as a Poisson process; a passenger waits
+    until the assigned lift arrives at their floor and then presses a button
+    for their destination. The same seed always produces the same run.
+
+    Wait percentiles include passengers still waiting when the run ends,
+    counted as waiting until the end, so saturation is not hidden.
+    """
+
+    def __init__(self, groups=1000, lifts_per_group=4, floors=20, calls_per_minute=3.0,
+                 floor_time=1.5, door_time=5.0, scheduler=LOOKScheduler, seed=0):
+        self.floors = floors
+        self.call_interval = 60.0 / calls_per_minute
+        self.floor_time = floor_time
+        self.door_time = door_time
+        self.rng = random.Random(seed)
+        self.lifts = []
+        self.dispatchers = []
+        if isinstance(scheduler, type) and issubclass(scheduler, SCANScheduler):
+            shaft = (0, floors - 1)
+        else:
+            shaft = ()
+        for _ in range(groups):
+            group = [Lift(scheduler(*shaft), verbose=False) for _ in range(lifts_per_group)]
+            self.lifts.extend(group)
+            self.dispatchers.append(GroupDispatcher(group))
+        self._lift_index = {id(lift): index for index, lift in enumerate(self.lifts)}
+        self._waiting = defaultdict(list)  # (lift index, floor) -> [(call time, destination)]
+        self._events = []
+        self._seq = 0
+        self.now = 0.0
+        self.waits = []
+        self.events_processed = 0
+
+    def _schedule(self, at, kind, target):
+        self._seq += 1
+        heapq.heappush(self._events, (at, self._seq, kind, target))
+
+    def _schedule_call(self, group):
+        self._schedule(self.now + self.rng.expovariate(1.0 / self.call_interval), HALL_CALL, group)
+
+    def _depart(self, index, delay):
+        lift = self.lifts[index]
+        travel = abs(lift.target_floor - lift.current_floor) * self.floor_time
+        self._schedule(self.now + delay + travel, ARRIVAL, index)
+
+    def _request(self, index, floor):
+        lift = self.lifts[index]
+        was_idle = lift.state is IDLE
+        lift.press_button(floor)
+        if was_idle:
+            self._depart(index, 0.0)
+
+    def _hall_call(self, group):
+        origin = self.rng.randrange(self.floors)
+        destination = self.rng.randrange(self.floors - 1)
+        if destination >= origin:
+            destination += 1
+        lift = self.dispatchers[group].assign(origin)
+        index = self._lift_index[id(lift)]
+        self._waiting[index, origin].append((self.now, destination))
+        self._request(index, origin)
+        self._schedule_call(group)
+
+    def _arrival(self, index):
+        lift = self.lifts[index]
+        floor = lift.target_floor
+        lift.arrive(floor)
+        boarding = self._waiting.pop((index, floor), ())
+        for called_at, destination in boarding:
+            self.waits.append(self.now - called_at)
+            lift.press_button(destination)
+        if lift.state is MOVING:
+            self._depart(index, self.door_time)
+
+    def run(self, duration=3600.0):
+        for group in range(len(self.dispatchers)):
+            self._schedule_call(group)
+        start = time.perf_counter()
+        while self._events and self._events[0][0] <= duration:
+            self.now, _, kind, target = heapq.heappop(self._events)
+            if kind == HALL_CALL:
+                self._hall_call(target)
+            else:
+                self._arrival(target)
+            self.events_processed += 1
+        self.now = duration
+        elapsed = time.perf_counter() - start
+        return self.report(elapsed)
+
+    def report(self, elapsed):
+        unserved = [self.now - called_at for calls in self._waiting.values() for called_at, _ in calls]
+        waits = sorted(self.waits + unserved)
+
+        def percentile(p):
+            return waits[min(len(waits) - 1, int(len(waits) * p))] if waits else 0.0
+
+        return {
+            "lifts": len(self.lifts),
+            "events": self.events_processed,
+            "events_per_sec": self.events_processed / elapsed if elapsed else 0.0,
+            "passengers": len(self.waits),
+            "unserved": len(unserved),
+            "wait_p50": percentile(0.50),
+            "wait_p90": percentile(0.90),
+            "wait_p99": percentile(0.99),
+            "wait_max": waits[-1] if waits else 0.0,
+        }
+
+# Example usage
+if __name__ == "__main__":
+    simulation = LiftSimulation(groups=1000, lifts_per_group=4, seed=7)
+    report = simulation.run(duration=3600.0)
+    print(f"Simulated {report['lifts']} lifts: {report['events']:,} events "
+          f"at {report['events_per_sec']:,.0f} events/sec")
+    print(f"Passengers served: {report['passengers']:,}, still waiting at the end: {report['unserved']:,}")
+    print(f"Wait time p50/p90/p99/max (s): {report['wait_p50']:.1f} / {report['wait_p90']:.1f} / "
+          f"{report['wait_p99']:.1f} / {report['wait_max']:.1f}")
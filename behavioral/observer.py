@@ -1,4 +1,8 @@
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 # Observer interface
 class Observer(ABC):
@@ -43,6 +47,136 @@ class ConcreteSubject(Subject):
         for observer in self._observers:
             observer.update(message)
 
+# A run of observers notified one after another by a single pool task
+class _Batch:
+    def __init__(self, observers):
+        self.observers = observers
+        self.index = 0        # observer currently (or last) running
+        self.started = None   # when it started, or None between observers
+        self.abandoned = False
+        self.errors = []
+        self.lock = threading.Lock()
+
+    def run(self, message):
+        for index, observer in enumerate(self.observers):
+            with self.lock:
+                if self.abandoned:
+                    return
+                self.index = index
+                self.started = time.monotonic()
+            try:
+                observer.update(message)
+            except Exception as error:
+                with self.lock:
+                    if not self.abandoned:
+                        self.errors.append((observer, error))
+            with self.lock:
+                self.started = None
+
+# Weak Concrete Subject
+class WeakSubject(Subject):
+    """
+    Subject that holds its observers by weak reference.
+
+    Observers are keyed by id() in an insertion-ordered dict, so attach and
+    detach are O(1), and an observer that is garbage collected removes itself.
+    Passing an executor fans notify() out over its worker threads, in tasks of
+    `batch_size` observers. Each observer is timed from when its update()
+    starts; one still running after `timeout` seconds is abandoned and the rest
+    of its batch is resubmitted, so a slow observer delays the others only
+    while it waits for a free worker. An abandoned update() keeps its worker
+    thread until it returns: a hung observer permanently takes a worker away
+    from the pool, and once every worker is held notify() waits for one.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor = None, timeout: float = None, batch_size=64):
+        self._observers = {}
+        self._executor = executor
+        self._timeout = timeout
+        self._batch_size = batch_size
+        self.errors = []
+
+    def attach(self, observer: Observer):
+        key = id(observer)
+        if key not in self._observers:
+            self._observers[key] = weakref.ref(observer, lambda ref, key=key: self._discard(key, ref))
+
+    def detach(self, observer: Observer):
+        del self._observers[id(observer)]
+
+    def _discard(self, key, ref):
+        if self._observers.get(key) is ref:
+            del self._observers[key]
+
+    def __len__(self):
+        return len(self._observers)
+
+    def _live_observers(self):
+        observers = []
+        for ref in list(self._observers.values()):
+            observer = ref()
+            if observer is not None:
+                observers.append(observer)
+        return observers
+
+    def notify(self, message: str):
+        """
+        Deliver `message` to every live observer.
+
+        Returns the observers that started but timed out, which is always empty
+        when notifying serially. In both modes an exception raised by an
+        observer does not stop the others; they are collected in `errors` as
+        (observer, exception) pairs.
+        """
+        observers = self._live_observers()
+        self.errors = []
+        if self._executor is None:
+            for observer in observers:
+                try:
+                    observer.update(message)
+                except Exception as error:
+                    self.errors.append((observer, error))
+            return []
+        return self._fan_out(observers, message)
+
+    def _fan_out(self, observers, message):
+        running = {}
+        timed_out = []
+
+        def submit(batch_observers):
+            batch = _Batch(batch_observers)
+            running[self._executor.submit(batch.run, message)] = batch
+
+        for start in range(0, len(observers), self._batch_size):
+            submit(observers[start:start + self._batch_size])
+        while running:
+            done, _ = wait(running, timeout=self._next_check(running.values()), return_when=FIRST_COMPLETED)
+            for future in done:
+                self.errors.extend(running.pop(future).errors)
+            if self._timeout is None:
+                continue
+            now = time.monotonic()
+            for future, batch in list(running.items()):
+                with batch.lock:
+                    if batch.started is None or now - batch.started < self._timeout:
+                        continue
+                    batch.abandoned = True
+                    rest = batch.observers[batch.index + 1:]
+                    timed_out.append(batch.observers[batch.index])
+                    self.errors.extend(batch.errors)
+                del running[future]
+                if rest:
+                    submit(rest)
+        return timed_out
+
+    def _next_check(self, batches):
+        """Seconds until the earliest running observer could overrun."""
+        if self._timeout is None:
+            return None
+        now = time.monotonic()
+        return max(0.0, min(self._timeout if batch.started is None else batch.started + self._timeout - now
+                            for batch in batches))
+
 # Example usage
 if __name__ == "__main__":
     subject = ConcreteSubject()
@@ -55,4 +189,15 @@ if __name__ == "__main__":
     subject.notify("Hello Observers!")
 
     subject.detach(observer1)
-    subject.notify("Second message")
\ No newline at end of file
+    subject.notify("Second message")
+
+    print("---")
+
+    weak_subject = WeakSubject(ThreadPoolExecutor(max_workers=4), timeout=0.5)
+    observer3 = ConcreteObserver("Observer 3")
+    weak_subject.attach(observer2)
+    weak_subject.attach(observer3)
+    weak_subject.notify("Hello weak observers!")
+
+    del observer3  # Collected observers detach themselves
+    print(f"Observers still attached: {len(weak_subject)}")
\ No newline at end of file
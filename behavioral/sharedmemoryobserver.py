@@ -0,0 +1,217 @@
+import multiprocessing
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+
+from .observer import ConcreteObserver, ConcreteSubject, Observer
+
+# Ring layout: a header, then `slots` fixed-size slots.
+#   header: head sequence (Q), closed flag (Q), slot count (I), payload size (I)
+#   slot:   seqlock word (Q), payload length (I), padding (I), payload bytes
+_HEADER = struct.Struct("<QQII")
+_HEADER_SIZE = 32
+_SLOT_HEADER = struct.Struct("<QI")
+_SLOT_HEADER_SIZE = 16
+_WORD = struct.Struct("<Q")
+
+# Producer side
+class SharedMemoryPublisher(Observer):
+    """
+    Observer that forwards every update into a shared-memory ring buffer.
+
+    Attach it to any Subject to fan notifications out to worker processes.
+    There is a single producer and any number of consumers; the producer never
+    waits for consumers, so a consumer that falls more than `slots` messages
+    behind loses the overwritten ones and sees a gap in the sequence numbers.
+    """
+
+    def __init__(self, slots=4096, slot_size=256, name=None):
+        self.slots = slots
+        self.slot_size = slot_size
+        self._stride = _SLOT_HEADER_SIZE + slot_size
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_SIZE + slots * self._stride)
+        self._buf = self._shm.buf
+        self._head = 0
+        _HEADER.pack_into(self._buf, 0, 0, 0, slots, slot_size)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def update(self, message: str):
+        self.publish(message.encode())
+
+    def publish(self, payload: bytes):
+        if len(payload) > self.slot_size:
+            raise ValueError(f"Message of {len(payload)} bytes exceeds slot size {self.slot_size}")
+        seq = self._head
+        offset = _HEADER_SIZE + (seq % self.slots) * self._stride
+        # Seqlock: an odd word marks the slot as being written, the even word
+        # 2 * seq + 2 marks it as holding message `seq`. This relies on the
+        # stores becoming visible in program order, as they do on x86-64.
+        _SLOT_HEADER.pack_into(self._buf, offset, 2 * seq + 1, len(payload))
+        start = offset + _SLOT_HEADER_SIZE
+        self._buf[start:start + len(payload)] = payload
+        _WORD.pack_into(self._buf, offset, 2 * seq + 2)
+        self._head = seq + 1
+        _WORD.pack_into(self._buf, 0, self._head)
+        return seq
+
+    def close(self):
+        """Tell consumers no more messages are coming."""
+        _WORD.pack_into(self._buf, 8, 1)
+
+    def unlink(self):
+        self._buf = None
+        self._shm.close()
+        self._shm.unlink()
+
+# Consumer side
+class SharedMemoryListener:
+    def __init__(self, name):
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._buf = self._shm.buf
+        _, _, self.slots, self.slot_size = _HEADER.unpack_from(self._buf, 0)
+        self._stride = _SLOT_HEADER_SIZE + self.slot_size
+        self.next_seq = 0
+        self.missed = 0
+
+    @property
+    def closed(self):
+        return _WORD.unpack_from(self._buf, 8)[0] == 1
+
+    def receive(self):
+        """Return (seq, payload) for the next message, or None if there is none yet."""
+        while True:
+            head = _WORD.unpack_from(self._buf, 0)[0]
+            if self.next_seq >= head:
+                return None
+            if head - self.next_seq > self.slots:
+                self._skip_to(head - self.slots)
+            seq = self.next_seq
+            offset = _HEADER_SIZE + (seq % self.slots) * self._stride
+            word, length = _SLOT_HEADER.unpack_from(self._buf, offset)
+            start = offset + _SLOT_HEADER_SIZE
+            payload = bytes(self._buf[start:start + length])
+            if word == 2 * seq + 2 and _WORD.unpack_from(self._buf, offset)[0] == word:
+                self.next_seq = seq + 1
+                return seq, payload
+            # The producer lapped us while we were copying; resynchronise.
+            self._skip_to(seq + 1)
+
+    def _skip_to(self, seq):
+        self.missed += seq - self.next_seq
+        self.next_seq = seq
+
+    def listen(self, observer: Observer, poll_interval=0.0005):
+        """Deliver messages to `observer` until the producer closes the ring."""
+        while True:
+            received = self.receive()
+            if received is not None:
+                observer.update(received[1].decode())
+            elif self.closed:
+                # The producer may have published more before closing.
+                while True:
+                    received = self.receive()
+                    if received is None:
+                        return
+                    observer.update(received[1].decode())
+            else:
+                time.sleep(poll_interval)
+
+    def close(self):
+        self._buf = None
+        self._shm.close()
+
+def _listen(name, observer):
+    listener = SharedMemoryListener(name)
+    listener.listen(observer)
+    listener.close()
+
+# Benchmark against multiprocessing.Queue
+class _LatencyObserver(Observer):
+    def __init__(self):
+        self.latencies = []
+
+    def update(self, message: str):
+        self.latencies.append(time.perf_counter_ns() - int(message[:20]))
+
+def _report(transport, count, elapsed, latencies, missed):
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] / 1000
+    p99 = latencies[int(len(latencies) * 0.99)] / 1000
+    print(f"{transport:>14} {count / elapsed:>12,.0f} {p50:>10.1f} {p99:>10.1f} {missed:>8}")
+
+def _ring_consumer(name, results):
+    listener = SharedMemoryListener(name)
+    observer = _LatencyObserver()
+    listener.listen(observer, poll_interval=0.00005)
+    results.put((observer.latencies, listener.missed))
+    listener.close()
+
+def _queue_consumer(queue, results):
+    observer = _LatencyObserver()
+    while True:
+        message = queue.get()
+        if message is None:
+            break
+        observer.update(message)
+    results.put((observer.latencies, 0))
+
+def _stamp():
+    return f"{time.perf_counter_ns():020d}" + "x" * 44
+
+def benchmark(messages=200_000):
+    print(f"{'transport':>14} {'msg/s':>12} {'p50 (us)':>10} {'p99 (us)':>10} {'missed':>8}")
+    results = multiprocessing.Queue()
+
+    publisher = SharedMemoryPublisher(slots=1 << 16, slot_size=64)
+    consumer = multiprocessing.Process(target=_ring_consumer, args=(publisher.name, results))
+    consumer.start()
+    start = time.perf_counter()
+    for _ in range(messages):
+        publisher.update(_stamp())
+    publisher.close()
+    latencies, missed = results.get()
+    elapsed = time.perf_counter() - start
+    consumer.join()
+    publisher.unlink()
+    _report("shared memory", messages, elapsed, latencies, missed)
+
+    queue = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=_queue_consumer, args=(queue, results))
+    consumer.start()
+    start = time.perf_counter()
+    for _ in range(messages):
+        queue.put(_stamp())
+    queue.put(None)
+    latencies, missed = results.get()
+    elapsed = time.perf_counter() - start
+    consumer.join()
+    _report("Queue", messages, elapsed, latencies, missed)
+
+# Example usage
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--benchmark"]:
+        benchmark()
+        sys.exit()
+
+    subject = ConcreteSubject()
+    publisher = SharedMemoryPublisher(slots=64)
+    subject.attach(publisher)
+
+    workers = [
+        multiprocessing.Process(target=_listen, args=(publisher.name, ConcreteObserver(f"Worker {i}")))
+        for i in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+
+    subject.notify("Hello from another process!")
+    subject.notify("Second message")
+    publisher.close()
+
+    for worker in workers:
+        worker.join()
+    publisher.unlink()
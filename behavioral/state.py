@@ -1,4 +1,118 @@
+import heapq
+import random
+import sys
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+
+# Scheduling policies: decide which queued floor the lift serves next
+class Scheduler(ABC):
+    @abstractmethod
+    def add(self, floor):
+        """Queue `floor`; returns False if it was already queued."""
+        pass
+
+    @abstractmethod
+    def next_floor(self, floor, direction):
+        """Pop the next floor to serve, given the lift is at `floor` travelling in `direction` (1, -1 or 0)."""
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+class FIFOScheduler(Scheduler):
+    def __init__(self):
+        self._queue = deque()
+        self._pending = set()
+
+    def add(self, floor):
+        if floor in self._pending:
+            return False
+        self._pending.add(floor)
+        self._queue.append(floor)
+        return True
+
+    def next_floor(self, floor, direction):
+        if not self._queue:
+            return None
+        next_floor = self._queue.popleft()
+        self._pending.discard(next_floor)
+        return next_floor
+
+    def __len__(self):
+        return len(self._queue)
+
+class LOOKScheduler(Scheduler):
+    """
+    Sweeps in one direction serving the nearest queued floor ahead, and turns
+    around once nothing is left ahead. Floors above the lift sit in a min-heap
+    and floors below in a max-heap, so each request costs O(log n).
+    """
+
+    def __init__(self):
+        self._up = []    # min-heap of floors
+        self._down = []  # max-heap of negated floors
+        self._pending = set()
+        self._direction = 1
+
+    def add(self, floor):
+        if floor in self._pending:
+            return False
+        self._pending.add(floor)
+        heapq.heappush(self._up, floor)
+        return True
+
+    def _rebalance(self, floor):
+        # Floors are filed by which side of the lift they were on; move the
+        # ones the lift has since passed to the other heap.
+        while self._up and self._up[0] < floor:
+            heapq.heappush(self._down, -heapq.heappop(self._up))
+        while self._down and -self._down[0] > floor:
+            heapq.heappush(self._up, -heapq.heappop(self._down))
+
+    def _turn(self, floor):
+        return None
+
+    def next_floor(self, floor, direction):
+        if not self._pending:
+            return None
+        self._rebalance(floor)
+        if direction:
+            self._direction = direction
+        ahead = self._up if self._direction > 0 else self._down
+        if not ahead:
+            end = self._turn(floor)
+            if end is not None:
+                return end
+            self._direction = -self._direction
+            ahead = self._up if self._direction > 0 else self._down
+        next_floor = heapq.heappop(ahead)
+        if ahead is self._down:
+            next_floor = -next_floor
+        self._pending.discard(next_floor)
+        return next_floor
+
+    def __len__(self):
+        return len(self._pending)
+
+class SCANScheduler(LOOKScheduler):
+    """Like LOOK, but runs to the end of the shaft before turning around."""
+
+    def __init__(self, lowest_floor, highest_floor):
+        super().__init__()
+        self.lowest_floor = lowest_floor
+        self.highest_floor = highest_floor
+
+    def add(self, floor):
+        if not self.lowest_floor <= floor <= self.highest_floor:
+            raise ValueError(f"Floor {floor} is outside the shaft ({self.lowest_floor}-{self.highest_floor})")
+        return super().add(floor)
+
+    def _turn(self, floor):
+        if self._direction > 0:
+            return self.highest_floor if self.highest_floor > floor else None
+        return self.lowest_floor if self.lowest_floor < floor else None
 
 # State interface
 class LiftState(ABC):
@@ -13,51 +127,123 @@ class LiftState(ABC):
 # Concrete States
 class IdleState(LiftState):
     def press_button(self, lift, floor):
-        print(f"Button for floor {floor} pressed. Lift starting to move.")
+        lift.announce(f"Button for floor {floor} pressed. Lift starting to move.")
         lift.target_floor = floor
-        lift.set_state(MovingState())
-    
+        lift.set_state(MOVING)
+
     def arrive(self, lift, floor):
-        print("Lift is idle. Already at the floor.")
+        lift.announce("Lift is idle. Already at the floor.")
 
 class MovingState(LiftState):
     def press_button(self, lift, floor):
-        print(f"Already moving. Added floor {floor} to queue.")
-        lift.queue.append(floor)
-    
+        if floor == lift.target_floor or not lift.scheduler.add(floor):
+            lift.announce(f"Floor {floor} already requested.")
+            return
+        lift.announce(f"Already moving. Added floor {floor} to queue.")
+
     def arrive(self, lift, floor):
-        print(f"Lift arrived at floor {floor}. Doors opening.")
+        lift.announce(f"Lift arrived at floor {floor}. Doors opening.")
+        direction = (floor > lift.current_floor) - (floor < lift.current_floor)
         lift.current_floor = floor
-        if lift.queue:
-            next_floor = lift.queue.pop(0)
-            print(f"Next target: floor {next_floor}")
+        next_floor = lift.scheduler.next_floor(floor, direction)
+        if next_floor is not None:
+            lift.announce(f"Next target: floor {next_floor}")
             lift.target_floor = next_floor
         else:
-            lift.set_state(IdleState())
+            lift.target_floor = None
+            lift.set_state(IDLE)
+
+# The states keep no per-lift data, so every lift shares these instances.
+IDLE = IdleState()
+MOVING = MovingState()
 
 # Context
 class Lift:
-    def __init__(self):
-        self.state = IdleState()
+    def __init__(self, scheduler: Scheduler = None, verbose=True):
+        self.state = IDLE
         self.current_floor = 0
         self.target_floor = None
-        self.queue = []
+        self.scheduler = scheduler if scheduler is not None else FIFOScheduler()
+        self.verbose = verbose
 
     def set_state(self, state):
         self.state = state
 
+    def announce(self, message):
+        if self.verbose:
+            print(message)
+
     def press_button(self, floor):
         self.state.press_button(self, floor)
 
     def arrive(self, floor):
         self.state.arrive(self, floor)
 
+# Benchmark: drive each scheduler with the same synthetic request stream
+def benchmark(requests=50_000, floors=100, rate=0.02, floor_time=1.0, stop_time=5.0, seed=42):
+    """
+    Requests arrive as a Poisson process of `rate` per second, below what
+    even FIFO can serve, so the queue stays short and the policies are
+    compared on the stops they choose rather than on a saturated backlog.
+    """
+    policies = {
+        "FIFO": FIFOScheduler,
+        "LOOK": LOOKScheduler,
+        "SCAN": lambda: SCANScheduler(0, floors - 1),
+    }
+    print(f"{'policy':>6} {'travel (floors)':>16} {'mean wait (s)':>14} {'p95 wait (s)':>13} {'per request (us)':>17}")
+    for name, make_scheduler in policies.items():
+        rng = random.Random(seed)
+        scheduler = make_scheduler()
+        requested_at = {}  # pending floor -> time of its oldest request
+        waits = []
+        floor, direction, travel, issued, now = 0, 0, 0, 0, 0.0
+        next_arrival = rng.expovariate(rate)
+        start = time.perf_counter()
+        while issued < requests or len(scheduler):
+            while issued < requests and next_arrival <= now:
+                requested = rng.randrange(floors)
+                if scheduler.add(requested):
+                    requested_at[requested] = next_arrival
+                issued += 1
+                next_arrival += rng.expovariate(rate)
+            target = scheduler.next_floor(floor, direction)
+            if target is None:
+                now = max(now, next_arrival)
+                continue
+            direction = (target > floor) - (target < floor)
+            travel += abs(target - floor)
+            now += abs(target - floor) * floor_time
+            floor = target
+            if target in requested_at:  # SCAN also stops at the shaft ends
+                waits.append(now - requested_at.pop(target))
+                now += stop_time
+        elapsed = time.perf_counter() - start
+        waits.sort()
+        print(f"{name:>6} {travel:>16,} {sum(waits) / len(waits):>14.1f} {waits[int(len(waits) * 0.95)]:>13.1f} "
+              f"{elapsed / requests * 1e6:>17.2f}")
+
 # Example usage
 if __name__ == "__main__":
+    if sys.argv[1:] == ["--benchmark"]:
+        benchmark()
+        sys.exit()
+
     lift = Lift()
     lift.press_button(3)   # Button for floor 3 pressed. Lift starting to move.
     lift.arrive(3)         # Lift arrived at floor 3. Doors opening.
     lift.press_button(5)   # Button for floor 5 pressed. Lift starting to move.
     lift.press_button(2)   # Already moving. Added floor 2 to queue.
     lift.arrive(5)         # Lift arrived at floor 5. Doors opening.
-    lift.arrive(2)         # Lift arrived at floor 2. Doors opening.
\ No newline at end of file
+    lift.arrive(2)         # Lift arrived at floor 2. Doors opening.
+
+    print("---")
+
+    lift = Lift(LOOKScheduler())
+    lift.press_button(4)   # Button for floor 4 pressed. Lift starting to move.
+    lift.press_button(1)   # Already moving. Added floor 1 to queue.
+    lift.press_button(6)   # Already moving. Added floor 6 to queue.
+    lift.press_button(6)   # Floor 6 already requested.
+    lift.arrive(4)         # Next target: floor 6 (keeps going up)
+    lift.arrive(6)         # Next target: floor 1
+    lift.arrive(1)
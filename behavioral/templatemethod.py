@@ -1,4 +1,17 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
 class DataProcessor(ABC):
     def process(self):
@@ -17,25 +30,427 @@ class DataProcessor(ABC):
     def save_data(self):
         print("Saving data to database.")
 
-class CSVDataProcessor(DataProcessor):
+class StreamingDataProcessor(DataProcessor):
+    """
+    Streaming variant of the template: the same three steps, but chunks of
+    records flow through them as generators, so only one chunk is held in
+    memory at a time regardless of the input size.
+
+    With workers > 1 the input is split into byte-range partitions on line
+    boundaries, which are parsed and processed in a process pool and saved in
+    input order. This assumes no record spans more than one line.
+
+    With incremental=True the input is cut into content-defined partitions
+    instead, which double as checkpoints: a partition ends after a line whose
+    hash falls under a threshold, so inserting or deleting lines only moves
+    the boundaries next to the edit. Each partition is recorded in a manifest
+    kept in the output database under a digest of its bytes, salted with the
+    input path and header, and committed in the same transaction as its rows.
+    A re-run only processes partitions whose digest is new and deletes the rows
+    of those that disappeared, and a crashed run resumes after the last
+    committed one. An unchanged file size and mtime skip the whole input
+    without hashing it. Incremental runs need `database`, and a table that
+    has been written by them only, since every row carries its partition's
+    digest in a _chunk column.
+    """
+
+    # How the input is opened as text, by read_data() and for each partition alike.
+    newline = None
+
+    def __init__(self, input_path, output_path=None, chunk_size=10_000, database=None,
+                 table="records", workers=1, partition_size=4 << 20, incremental=False, encoding="utf-8"):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.chunk_size = chunk_size
+        self.database = database
+        self.table = table
+        self.workers = workers
+        self.partition_size = partition_size
+        if incremental and database is None:
+            raise ValueError("incremental=True needs a database to keep its manifest and rows in")
+        self.incremental = incremental
+        self.encoding = encoding
+        self.skipped_chunks = 0
+        self.reprocessed_chunks = 0
+
+    def process(self):
+        if self.incremental:
+            return self._process_incrementally()
+        if self.workers > 1:
+            chunks = self._process_partitions()
+        else:
+            chunks = self.process_data(self.read_data())
+        return self.save_data(chunks)
+
+    @abstractmethod
     def read_data(self):
-        print("Reading data from CSV file.")
+        """Yield lists of at most `chunk_size` records."""
+        pass
 
-    def process_data(self):
-        print("Processing CSV data.")
+    @abstractmethod
+    def parse_lines(self, lines):
+        """Turn an iterable of text lines into records."""
+        pass
+
+    def data_offset(self):
+        """Byte offset of the first record, e.g. past a header line."""
+        return 0
+
+    def process_data(self, chunks):
+        for chunk in chunks:
+            yield [record for record in map(self.transform, chunk) if record is not None]
+
+    def transform(self, record):
+        """Hook for a single record; return None to drop it."""
+        return record
+
+    def save_data(self, chunks):
+        """Bulk-insert each chunk into SQLite in one transaction; returns the number of records saved."""
+        saved = 0
+        connection = sqlite3.connect(self.database)
+        try:
+            for chunk in chunks:
+                if chunk:
+                    with connection:
+                        self._insert(connection, chunk)
+                    saved += len(chunk)
+        finally:
+            connection.close()
+        return saved
+
+    def _insert(self, connection, records, **extra):
+        """Insert `records` with the columns of the first one; a record with any other field is an error."""
+        fields = list(records[0])
+        known = set(fields)
+        table = _identifier(self.table)
+        column_list = ", ".join(_identifier(column) for column in fields + list(extra))
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({column_list})")
+        insert = f'INSERT INTO {table} ({column_list}) VALUES ({", ".join("?" * (len(fields) + len(extra)))})'
+
+        def rows():
+            for record in records:
+                unexpected = record.keys() - known
+                if unexpected:
+                    raise ValueError(f"Record has fields not in the columns {fields}: {sorted(unexpected)}")
+                yield [_sql_value(record.get(field)) for field in fields] + list(extra.values())
+
+        connection.executemany(insert, rows())
+
+    def _chunked(self, records):
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def partitions(self):
+        """Split the input into (start, end) byte ranges that begin and end on line boundaries."""
+        size = os.path.getsize(self.input_path)
+        start = self.data_offset()
+        ranges = []
+        with open(self.input_path, "rb") as f:
+            while start < size:
+                f.seek(min(start + self.partition_size, size))
+                f.readline()
+                end = min(f.tell(), size)
+                ranges.append((start, end))
+                start = end
+        return ranges
+
+    def _read_bytes(self, start, end):
+        with open(self.input_path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def content_partitions(self):
+        """
+        Yield (start, end, data) for partitions of about `partition_size` bytes
+        whose boundaries depend only on nearby lines. Each line ends a partition
+        with probability proportional to its length, between a quarter of and
+        four times `partition_size`.
+        """
+        start = position = self.data_offset()
+        minimum = self.partition_size // 4
+        maximum = self.partition_size * 4
+        scale = (1 << 32) / max(1, self.partition_size - minimum)
+        lines = []
+        with open(self.input_path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                lines.append(line)
+                position += len(line)
+                size = position - start
+                if size >= maximum or (size >= minimum and zlib.crc32(line) < len(line) * scale):
+                    yield start, position, b"".join(lines)
+                    start = position
+                    lines = []
+        if lines:
+            yield start, position, b"".join(lines)
+
+    def _open(self):
+        return open(self.input_path, encoding=self.encoding, newline=self.newline)
+
+    def read_range(self, start, end):
+        # Split lines exactly as read_data() does; str.splitlines() would also
+        # break on characters such as U+2028 that are valid inside a record.
+        data = io.BytesIO(self._read_bytes(start, end))
+        lines = io.TextIOWrapper(data, encoding=self.encoding, newline=self.newline)
+        yield from self._chunked(iter(self.parse_lines(lines)))
+
+    def _process_range(self, start, end):
+        return list(self.process_data(self.read_range(start, end)))
+
+    def _map_ranges(self, ranges):
+        """Yield the processed chunks of each range in order, using a process pool when workers > 1."""
+        if self.workers <= 1:
+            for start, end in ranges:
+                yield self._process_range(start, end)
+            return
+        # Keep a bounded number of partitions in flight so results cannot
+        # pile up faster than save_data consumes them.
+        with ProcessPoolExecutor(self.workers) as pool:
+            in_flight = deque()
+            for start, end in ranges:
+                in_flight.append(pool.submit(self._process_range, start, end))
+                if len(in_flight) >= 2 * self.workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def _process_partitions(self):
+        for chunks in self._map_ranges(self.partitions()):
+            yield from chunks
+
+    def _process_incrementally(self):
+        self.skipped_chunks = self.reprocessed_chunks = 0
+        path = os.path.abspath(self.input_path)
+        stat = os.stat(path)
+        connection = sqlite3.connect(self.database)
+        try:
+            columns = [row[1] for row in connection.execute(f"PRAGMA table_info({_identifier(self.table)})")]
+            if columns and "_chunk" not in columns:
+                raise ValueError(f"Table {self.table!r} was not written incrementally (it has no _chunk column); "
+                                 "use a new table")
+            connection.execute("CREATE TABLE IF NOT EXISTS _manifest_files "
+                               "(table_name, path, size, mtime_ns, PRIMARY KEY (table_name, path))")
+            connection.execute("CREATE TABLE IF NOT EXISTS _manifest_chunks "
+                               "(table_name, path, chunk, start, end, digest, PRIMARY KEY (table_name, path, chunk))")
+            committed = {chunk for chunk, in connection.execute(
+                "SELECT chunk FROM _manifest_chunks WHERE table_name = ? AND path = ?", (self.table, path))}
+            fingerprint = connection.execute(
+                "SELECT size, mtime_ns FROM _manifest_files WHERE table_name = ? AND path = ?",
+                (self.table, path)).fetchone()
+            if fingerprint == (stat.st_size, stat.st_mtime_ns):
+                self.skipped_chunks = len(committed)
+                return 0
+
+            # Salting every digest with the path and header means a changed
+            # header (e.g. renamed CSV columns) invalidates every partition.
+            header = self._read_bytes(0, self.data_offset())
+            salt = hashlib.blake2b(path.encode() + b"\0" + header, digest_size=32).digest()
+            current = []
+            occurrences = {}
+            for start, end, data in self.content_partitions():
+                digest = hashlib.blake2b(data, digest_size=16, key=salt).hexdigest()
+                # Identical partitions each need their own rows.
+                occurrences[digest] = occurrences.get(digest, 0) + 1
+                chunk = digest if occurrences[digest] == 1 else f"{digest}.{occurrences[digest]}"
+                current.append((chunk, start, end, digest))
+            current_chunks = {chunk for chunk, _, _, _ in current}
+            stale = committed - current_chunks
+            changed = [entry for entry in current if entry[0] not in committed]
+            self.skipped_chunks = len(current) - len(changed)
+
+            with connection:
+                if stale and self._table_exists(connection):
+                    connection.executemany(f"DELETE FROM {_identifier(self.table)} WHERE _chunk = ?",
+                                           ((chunk,) for chunk in stale))
+                connection.executemany("DELETE FROM _manifest_chunks WHERE table_name = ? AND path = ? AND chunk = ?",
+                                       ((self.table, path, chunk) for chunk in stale))
+
+            saved = 0
+            results = self._map_ranges([(start, end) for _, start, end, _ in changed])
+            for (chunk_key, start, end, digest), chunks in zip(changed, results):
+                # The rows and their checkpoint commit together, so a crash
+                # leaves either both or neither.
+                with connection:
+                    for chunk in chunks:
+                        if chunk:
+                            self._insert(connection, chunk, _chunk=chunk_key)
+                            saved += len(chunk)
+                    connection.execute("INSERT OR REPLACE INTO _manifest_chunks VALUES (?, ?, ?, ?, ?, ?)",
+                                       (self.table, path, chunk_key, start, end, digest))
+                self.reprocessed_chunks += 1
+
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO _manifest_files VALUES (?, ?, ?, ?)",
+                                   (self.table, path, stat.st_size, stat.st_mtime_ns))
+            return saved
+        finally:
+            connection.close()
+
+    def _table_exists(self, connection):
+        # The data table only exists once some partition produced rows.
+        return connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                  (self.table,)).fetchone() is not None
+
+def _identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def _sql_value(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value)
+
+class CSVDataProcessor(StreamingDataProcessor):
+    """
+    Writes CSV output with the columns of the first saved record. Later
+    records missing a column get an empty value; a record with a column the
+    first one lacked is an error, since the header is already written.
+    """
+
+    newline = ""
 
-class JSONDataProcessor(DataProcessor):
     def read_data(self):
-        print("Reading data from JSON file.")
+        with self._open() as f:
+            yield from self._chunked(csv.DictReader(f))
 
-    def process_data(self):
-        print("Processing JSON data.")
+    def data_offset(self):
+        with open(self.input_path, "rb") as f:
+            header = f.readline()
+        self._fieldnames = next(csv.reader([header.decode(self.encoding)]))
+        return len(header)
+
+    def parse_lines(self, lines):
+        return csv.DictReader(lines, fieldnames=self._fieldnames)
+
+    def save_data(self, chunks):
+        if self.database is not None:
+            return super().save_data(chunks)
+        saved = 0
+        with open(self.output_path, "w", newline="") as f:
+            writer = None
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(chunk[0]), restval="", extrasaction="raise")
+                    writer.writeheader()
+                try:
+                    writer.writerows(chunk)
+                except ValueError as error:
+                    raise ValueError(f"Record does not fit the CSV header {writer.fieldnames}: {error}") from error
+                saved += len(chunk)
+        return saved
+
+class JSONDataProcessor(StreamingDataProcessor):
+    """Reads and writes JSON Lines: one JSON object per line."""
+
+    def read_data(self):
+        with self._open() as f:
+            yield from self._chunked(iter(self.parse_lines(f)))
+
+    def parse_lines(self, lines):
+        return (json.loads(line) for line in lines if line.strip())
+
+    def save_data(self, chunks):
+        if self.database is not None:
+            return super().save_data(chunks)
+        saved = 0
+        with open(self.output_path, "w") as f:
+            for chunk in chunks:
+                f.write("".join(json.dumps(record) + "\n" for record in chunk))
+                saved += len(chunk)
+        return saved
+
+# Scaling benchmark: CPU-bound transform over a synthetic CSV, 1..N workers
+class _ChecksumCSV(CSVDataProcessor):
+    def transform(self, record):
+        digest = record["payload"].encode()
+        for _ in range(50):
+            digest = hashlib.sha256(digest).digest()
+        record["checksum"] = digest.hex()
+        return record
+
+def benchmark_scaling(rows=200_000, max_workers=None):
+    max_workers = max_workers or os.cpu_count()
+    with tempfile.TemporaryDirectory() as workdir:
+        source = os.path.join(workdir, "input.csv")
+        with open(source, "w") as f:
+            f.write("id,payload\n")
+            f.writelines(f"{i},row-{i}\n" for i in range(rows))
+        print(f"{'workers':>7} {'rows/s':>12} {'speedup':>8}")
+        baseline = None
+        for workers in range(1, max_workers + 1):
+            database = os.path.join(workdir, f"out-{workers}.db")
+            processor = _ChecksumCSV(source, database=database, workers=workers, partition_size=1 << 20)
+            started = time.perf_counter()
+            processor.process()
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {rows / elapsed:>12,.0f} {baseline / elapsed:>7.2f}x")
+
+def benchmark_incremental(rows=200_000, appended=2_000):
+    with tempfile.TemporaryDirectory() as workdir:
+        source = os.path.join(workdir, "input.csv")
+        with open(source, "w") as f:
+            f.write("id,payload\n")
+            f.writelines(f"{i},row-{i}\n" for i in range(rows))
+        database = os.path.join(workdir, "out.db")
+
+        def run(label):
+            processor = _ChecksumCSV(source, database=database, partition_size=256 << 10, incremental=True)
+            started = time.perf_counter()
+            processor.process()
+            elapsed = time.perf_counter() - started
+            print(f"{label:>18} {elapsed:>9.3f} {processor.skipped_chunks:>8} {processor.reprocessed_chunks:>12}")
+
+        print(f"{'run':>18} {'time (s)':>9} {'skipped':>8} {'reprocessed':>12}")
+        run("first run")
+        run("unchanged")
+        os.utime(source)
+        run("touched")
+        with open(source, "a") as f:
+            f.writelines(f"{i},row-{i}\n" for i in range(rows, rows + appended))
+        run(f"{appended} rows added")
 
 if __name__ == "__main__":
-    csv_processor = CSVDataProcessor()
-    csv_processor.process()
+    if sys.argv[1:] == ["--benchmark"]:
+        benchmark_scaling()
+        benchmark_incremental()
+        sys.exit()
+
+    class ActiveUsersCSV(CSVDataProcessor):
+        def transform(self, record):
+            return record if record["active"] == "yes" else None
+
+    with tempfile.TemporaryDirectory() as workdir:
+        users_csv = os.path.join(workdir, "users.csv")
+        with open(users_csv, "w") as f:
+            f.write("name,active\nada,yes\nbob,no\ncy,yes\n")
+        csv_processor = ActiveUsersCSV(users_csv, os.path.join(workdir, "active.csv"), chunk_size=2)
+        print(f"CSV records saved: {csv_processor.process()}")
+
+        print("---")
+
+        events_jsonl = os.path.join(workdir, "events.jsonl")
+        with open(events_jsonl, "w") as f:
+            f.write('{"event": "login"}\n{"event": "logout"}\n')
+        json_processor = JSONDataProcessor(events_jsonl, os.path.join(workdir, "events.out.jsonl"))
+        print(f"JSON records saved: {json_processor.process()}")
+
+        print("---")
+
+        database = os.path.join(workdir, "events.db")
+        json_to_sqlite = JSONDataProcessor(events_jsonl, database=database, workers=2)
+        print(f"JSON records inserted into SQLite: {json_to_sqlite.process()}")
 
-    print("---")
+        print("---")
 
-    json_processor = JSONDataProcessor()
-    json_processor.process()
\ No newline at end of file
+        incremental = JSONDataProcessor(events_jsonl, database=database, table="incremental",
+                                        partition_size=20, incremental=True)
+        incremental.process()
+        with open(events_jsonl, "a") as f:
+            f.write('{"event": "login"}\n')
+        incremental.process()
+        print(f"Chunks skipped: {incremental.skipped_chunks}, reprocessed: {incremental.reprocessed_chunks}")
@@ -0,0 +1,244 @@
+import sys
+import threading
+import time
+from collections import deque
+
+from .observer import ConcreteObserver, ConcreteSubject, Observer
+
+# Overflow policies for a subscription's ring buffer
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+BLOCK = "block"
+
+# Mailbox (bounded ring buffer between a publisher and one observer)
+class Mailbox:
+    """
+    Bounded FIFO of (topic, message) entries.
+
+    When the buffer is full, DROP_OLDEST evicts the oldest entry, BLOCK makes
+    the publisher wait for the consumer, and COALESCE first overwrites a
+    pending entry for the same topic in place before falling back to
+    evicting the oldest one.
+    """
+
+    def __init__(self, capacity=1024, policy=DROP_OLDEST):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if policy not in (DROP_OLDEST, COALESCE, BLOCK):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self._entries = deque()
+        self._pending = {}
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def put(self, topic, message):
+        with self._cond:
+            if self.policy == COALESCE:
+                entry = self._pending.get(topic)
+                if entry is not None:
+                    entry[1] = message
+                    self.coalesced += 1
+                    return
+            elif self.policy == BLOCK:
+                while len(self._entries) >= self.capacity:
+                    self._cond.wait()
+            if len(self._entries) >= self.capacity:
+                oldest = self._entries.popleft()
+                if self._pending.get(oldest[0]) is oldest:
+                    del self._pending[oldest[0]]
+                self.dropped += 1
+            entry = [topic, message]
+            self._entries.append(entry)
+            if self.policy == COALESCE:
+                self._pending[topic] = entry
+            self._cond.notify_all()
+
+    def take(self, max_items=None, timeout=None):
+        with self._cond:
+            if not self._entries and timeout:
+                self._cond.wait(timeout)
+            count = len(self._entries) if max_items is None else min(max_items, len(self._entries))
+            taken = [self._entries.popleft() for _ in range(count)]
+            for topic, _ in taken:
+                self._pending.pop(topic, None)
+            if taken:
+                self._cond.notify_all()
+            return taken
+
+# Subscription
+class Subscription:
+    def __init__(self, observer: Observer, pattern: str, mailbox: Mailbox):
+        self.observer = observer
+        self.pattern = pattern
+        self.mailbox = mailbox
+
+    def deliver(self, max_items=None, timeout=None):
+        """Hand buffered messages to the observer; called from the consumer's thread."""
+        entries = self.mailbox.take(max_items, timeout)
+        for _, message in entries:
+            self.observer.update(message)
+        return len(entries)
+
+# Trie node for wildcard patterns
+class _TopicNode:
+    __slots__ = ("children", "exact", "rest")
+
+    def __init__(self):
+        self.children = {}
+        self.exact = {}  # patterns ending at this node
+        self.rest = {}   # patterns ending in "#" at this node
+
+# Topic Subject
+class TopicSubject:
+    """
+    Publishes messages to observers subscribed by topic pattern.
+
+    Topics are dot-separated, e.g. "orders.eu.created". In a pattern "*"
+    matches exactly one segment and a trailing "#" matches zero or more.
+    Patterns without wildcards live in a dict, the rest in a trie, so a
+    publish only visits the subscriptions that can match.
+    """
+
+    def __init__(self):
+        self._exact = {}
+        self._root = _TopicNode()
+        self._lock = threading.Lock()
+
+    def subscribe(self, observer: Observer, pattern: str, capacity=1024, policy=DROP_OLDEST):
+        segments = pattern.split(".")
+        if "#" in segments[:-1]:
+            raise ValueError("'#' is only allowed as the last segment of a pattern")
+        subscription = Subscription(observer, pattern, Mailbox(capacity, policy))
+        with self._lock:
+            if "*" not in segments and "#" not in segments:
+                self._exact.setdefault(pattern, {})[id(subscription)] = subscription
+            else:
+                node = self._root
+                for segment in segments[:-1]:
+                    node = node.children.setdefault(segment, _TopicNode())
+                if segments[-1] == "#":
+                    node.rest[id(subscription)] = subscription
+                else:
+                    node = node.children.setdefault(segments[-1], _TopicNode())
+                    node.exact[id(subscription)] = subscription
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        segments = subscription.pattern.split(".")
+        with self._lock:
+            if "*" not in segments and "#" not in segments:
+                bucket = self._exact[subscription.pattern]
+                del bucket[id(subscription)]
+                if not bucket:
+                    del self._exact[subscription.pattern]
+                return
+            path = [self._root]
+            for segment in segments[:-1]:
+                path.append(path[-1].children[segment])
+            if segments[-1] == "#":
+                del path[-1].rest[id(subscription)]
+            else:
+                path.append(path[-1].children[segments[-1]])
+                del path[-1].exact[id(subscription)]
+            # Prune nodes left empty, deepest first.
+            for parent, segment in zip(reversed(path[:-1]), reversed(segments[:len(path) - 1])):
+                node = parent.children[segment]
+                if node.children or node.exact or node.rest:
+                    break
+                del parent.children[segment]
+
+    def _match(self, topic):
+        matches = list(self._exact.get(topic, {}).values())
+        segments = topic.split(".")
+        stack = [(self._root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            matches.extend(node.rest.values())
+            if depth == len(segments):
+                matches.extend(node.exact.values())
+                continue
+            child = node.children.get(segments[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+            child = node.children.get("*")
+            if child is not None:
+                stack.append((child, depth + 1))
+        return matches
+
+    def publish(self, topic: str, message: str):
+        """Buffer `message` for every matching subscription; returns how many matched."""
+        if {"*", "#"} & set(topic.split(".")):
+            raise ValueError(f"Published topics cannot contain wildcards: {topic!r}")
+        with self._lock:
+            matches = self._match(topic)
+        for subscription in matches:
+            subscription.mailbox.put(topic, message)
+        return len(matches)
+
+# Broadcast baseline: every observer sees every message and filters it itself
+class _FilteringObserver(Observer):
+    def __init__(self, topic):
+        self.topic = topic
+        self.received = 0
+
+    def update(self, message):
+        if message[0] == self.topic:
+            self.received += 1
+
+class _CountingObserver(Observer):
+    def update(self, message):
+        pass
+
+def benchmark(topic_counts=(10, 100, 1000, 10000), messages=20000):
+    print(f"{'topics':>8} {'indexed msg/s':>15} {'broadcast msg/s':>17}")
+    for count in topic_counts:
+        topics = [f"sensor.{i}.temperature" for i in range(count)]
+
+        subject = TopicSubject()
+        for topic in topics:
+            subject.subscribe(_CountingObserver(), topic, capacity=64)
+        for i in range(min(count, 10)):
+            subject.subscribe(_CountingObserver(), f"sensor.{i}.*", capacity=64)
+        start = time.perf_counter()
+        for i in range(messages):
+            subject.publish(topics[i % count], "21.5")
+        indexed = messages / (time.perf_counter() - start)
+
+        broadcast_subject = ConcreteSubject()
+        for topic in topics:
+            broadcast_subject.attach(_FilteringObserver(topic))
+        sample = max(1, min(messages, 2_000_000 // count))
+        start = time.perf_counter()
+        for i in range(sample):
+            broadcast_subject.notify((topics[i % count], "21.5"))
+        broadcast = sample / (time.perf_counter() - start)
+
+        print(f"{count:>8} {indexed:>15,.0f} {broadcast:>17,.0f}")
+
+# Example usage
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--benchmark"]:
+        benchmark()
+        sys.exit()
+
+    subject = TopicSubject()
+    orders = subject.subscribe(ConcreteObserver("Order log"), "orders.#")
+    prices = subject.subscribe(ConcreteObserver("Price ticker"), "prices.*", capacity=2, policy=COALESCE)
+    eu_only = subject.subscribe(ConcreteObserver("EU desk"), "orders.eu.created")
+
+    subject.publish("orders.eu.created", "Order 1 created")
+    subject.publish("orders.us.shipped", "Order 2 shipped")
+    for price in ("101", "102", "103"):
+        subject.publish("prices.ACME", f"ACME at {price}")
+    subject.publish("prices.INIT", "INIT at 7")
+    subject.publish("prices.ACME.history", "Not delivered to anyone")
+
+    for subscription in (orders, prices, eu_only):
+        subscription.deliver()
+    print(f"Price updates coalesced: {prices.mailbox.coalesced}")
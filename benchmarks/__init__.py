@@ -0,0 +1 @@
+'''Benchmarks and instrumentation for the pattern packages; run the modules with `python -m`.'''
@@ -0,0 +1,79 @@
+'''
+Import-time budget check for the pattern packages.
+
+Usage
+- python -m benchmarks.importtime [--package-budget-ms 20] [--full-budget-ms 250]
+
+Each check imports in a fresh interpreter and keeps the best of --runs
+attempts. It fails (exit status 1) if importing the packages loads any
+submodule, if any import prints, or if the import time goes over budget.
+'''
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = ("creational", "structural", "behavioral")
+
+# Runs in the child interpreter; times `imports` and reports as JSON.
+PROBE = """
+import contextlib, io, json, sys, time
+output = io.StringIO()
+start = time.perf_counter()
+with contextlib.redirect_stdout(output):
+    exec(sys.argv[1])
+elapsed = time.perf_counter() - start
+submodules = sorted(name for name in sys.modules if name.partition(".")[0] in sys.argv[2:] and "." in name)
+print(json.dumps({"ms": elapsed * 1000, "output": output.getvalue(), "submodules": submodules}))
+"""
+
+IMPORT_PACKAGES = f"import {', '.join(PACKAGES)}"
+
+IMPORT_EVERYTHING = f"""
+import {", ".join(PACKAGES)}
+for package in ({", ".join(PACKAGES)}):
+    for name in package.__all__:
+        getattr(package, name)
+"""
+
+def probe(imports):
+    result = subprocess.run([sys.executable, "-c", PROBE, imports, *PACKAGES],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    report = json.loads(result.stdout)
+    if report["output"]:
+        raise RuntimeError(f"import printed output: {report['output'].strip()!r}")
+    return report
+
+def check(label, imports, budget_ms, runs, lazy=False):
+    try:
+        reports = [probe(imports) for _ in range(runs)]
+        if lazy and reports[0]["submodules"]:
+            raise RuntimeError(f"importing the packages also loaded {reports[0]['submodules']}")
+    except RuntimeError as error:
+        print(f"{label:<24} FAILED: {error}")
+        return False
+    best_ms = min(report["ms"] for report in reports)
+    ok = best_ms <= budget_ms
+    print(f"{label:<24} {best_ms:>8.2f} ms (budget {budget_ms:g} ms){'' if ok else '  OVER BUDGET'}")
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--package-budget-ms", type=float, default=20.0)
+    parser.add_argument("--full-budget-ms", type=float, default=250.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = [
+        check("import packages", IMPORT_PACKAGES, args.package_budget_ms, args.runs, lazy=True),
+        check("import all submodules", IMPORT_EVERYTHING, args.full_budget_ms, args.runs),
+    ]
+    return 0 if all(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
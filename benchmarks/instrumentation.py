@@ -0,0 +1,207 @@
+'''
+Opt-in latency instrumentation for the patterns' entry points.
+
+Instrumentation.instrument() swaps the hooked methods of the given classes
+(or of every class defined in the given modules) for timing wrappers, and
+uninstrument() puts the originals back, so nothing is paid while it is off.
+Each (class, method) pair gets a call count and a log-linear latency
+histogram, exportable as JSON or in the Prometheus text format.
+
+Usage
+- python -m benchmarks.instrumentation            # Prometheus text
+- python -m benchmarks.instrumentation --json
+'''
+
+import functools
+import json
+import sys
+import time
+import types
+
+HOOKED_METHODS = ("fetch_data", "display", "draw", "cost", "notify", "handle", "execute_command", "process")
+
+# Upper bounds in seconds of the Prometheus buckets: 100 ns to 10 s in 1-2.5-5 steps.
+# Every series uses the same bounds so they can be aggregated by `le`.
+PROMETHEUS_BUCKETS = tuple(mantissa * 10.0 ** exponent
+                           for exponent in range(-7, 1) for mantissa in (1, 2.5, 5)) + (10.0,)
+
+# Histogram
+class LatencyHistogram:
+    """
+    HdrHistogram-style log-linear histogram of nanosecond latencies.
+
+    Values below 2 ** SUB_BUCKET_BITS are counted exactly; above that each
+    power of two is split into 2 ** (SUB_BUCKET_BITS - 1) linear buckets, so a
+    recorded value is off by at most 1 / 2 ** (SUB_BUCKET_BITS - 1).
+    """
+
+    SUB_BUCKET_BITS = 6
+    _SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    _HALF = _SUB_BUCKETS >> 1
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def bucket_index(cls, value):
+        if value < cls._SUB_BUCKETS:
+            return value
+        exponent = value.bit_length() - cls.SUB_BUCKET_BITS
+        return cls._SUB_BUCKETS + (exponent - 1) * cls._HALF + (value >> exponent) - cls._HALF
+
+    @classmethod
+    def bucket_bounds(cls, index):
+        """Inclusive (lowest, highest) value counted by bucket `index`."""
+        if index < cls._SUB_BUCKETS:
+            return index, index
+        exponent, offset = divmod(index - cls._SUB_BUCKETS, cls._HALF)
+        exponent += 1
+        lowest = (offset + cls._HALF) << exponent
+        return lowest, lowest + (1 << exponent) - 1
+
+    def record(self, value):
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        if not self.count:
+            return 0
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum_ns": self.total,
+            "min_ns": self.min or 0,
+            "max_ns": self.max or 0,
+            "mean_ns": self.total / self.count if self.count else 0,
+            "p50_ns": self.percentile(50),
+            "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99),
+            "p999_ns": self.percentile(99.9),
+            "buckets": {self.bucket_bounds(index)[1]: self.counts[index] for index in sorted(self.counts)},
+        }
+
+# Instrumentation
+class Instrumentation:
+    def __init__(self, methods=HOOKED_METHODS):
+        self.methods = methods
+        self.histograms = {}
+        self._patched = []
+
+    def instrument(self, *targets):
+        """Wrap the hooked methods defined by each class, or by each class defined in each module."""
+        for target in targets:
+            if isinstance(target, types.ModuleType):
+                classes = [value for value in vars(target).values()
+                           if isinstance(value, type) and value.__module__ == target.__name__]
+            else:
+                classes = [target]
+            for cls in classes:
+                for name in self.methods:
+                    if name in vars(cls):
+                        self._patch(cls, name)
+        return self
+
+    def uninstrument(self):
+        while self._patched:
+            cls, name, original = self._patched.pop()
+            setattr(cls, name, original)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstrument()
+
+    def _patch(self, cls, name):
+        original = vars(cls)[name]
+        if isinstance(original, (staticmethod, classmethod)):
+            func = original.__func__
+        else:
+            func = original
+        if not callable(func) or getattr(func, "__isabstractmethod__", False):
+            return
+        histogram = self.histograms.setdefault((f"{cls.__module__}.{cls.__qualname__}", name), LatencyHistogram())
+        record = histogram.record
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(clock() - start)
+
+        setattr(cls, name, type(original)(timed) if func is not original else timed)
+        self._patched.append((cls, name, original))
+
+    def to_json(self, **kwargs):
+        return json.dumps({f"{cls}.{method}": histogram.to_dict()
+                           for (cls, method), histogram in sorted(self.histograms.items())}, **kwargs)
+
+    def to_prometheus(self, metric="pattern_call_duration_seconds", buckets=PROMETHEUS_BUCKETS):
+        """
+        Export in the Prometheus text format with the same `buckets` for every
+        series. Each histogram bucket is counted under the first bound at or
+        above its highest value, so a latency within the histogram's resolution
+        of a bound may be counted one bucket high.
+        """
+        lines = [
+            f"# HELP {metric} Latency of instrumented design pattern entry points.",
+            f"# TYPE {metric} histogram",
+        ]
+        for (cls, method), histogram in sorted(self.histograms.items()):
+            labels = f'class="{cls}",method="{method}"'
+            counts = sorted((histogram.bucket_bounds(index)[1], count) for index, count in histogram.counts.items())
+            cumulative = position = 0
+            for upper in buckets:
+                while position < len(counts) and counts[position][0] <= upper * 1e9:
+                    cumulative += counts[position][1]
+                    position += 1
+                lines.append(f'{metric}_bucket{{{labels},le="{upper:.9g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.total / 1e9:.9g}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+# Example usage
+if __name__ == "__main__":
+    from behavioral import chainofreponsibility as chain
+    from structural import composition, decorator
+
+    from .patterns import quiet
+
+    with Instrumentation().instrument(composition, decorator, chain) as instrumentation:
+        scene = composition.CompositeGraphic()
+        scene.add(composition.Circle())
+        scene.add(composition.Square())
+        coffee = decorator.MilkDecorator(decorator.SugarDecorator(decorator.SimpleCoffee()))
+        handler = chain.ConcreteHandlerA(chain.ConcreteHandlerB(chain.ConcreteHandlerC()))
+        with quiet():
+            for request in range(1000):
+                scene.draw()
+                coffee.cost()
+                handler.handle(request % 30)
+
+    if sys.argv[1:] == ["--json"]:
+        print(instrumentation.to_json(indent=2))
+    else:
+        print(instrumentation.to_prometheus(), end="")
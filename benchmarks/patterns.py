@@ -0,0 +1,208 @@
+'''
+Micro-benchmarks for the hot path of each pattern.
+
+Usage
+- python -m benchmarks.patterns run -o results.json
+- python -m benchmarks.patterns compare baseline.json results.json
+
+Each benchmark times one operation. The loop count is calibrated so a sample
+takes at least --min-time seconds, a few warmup samples are discarded, and the
+statistics are taken over --repeat samples. Patterns that print while they run
+write to os.devnull during timing, so their numbers include that cost.
+'''
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+@contextlib.contextmanager
+def quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+# Benchmarks: each returns a zero-argument callable performing one operation
+def bench_factory_get_shape():
+    from creational.factory import ShapeFactory
+    return lambda: ShapeFactory.get_shape("square")
+
+def bench_singleton():
+    from creational.singleton import Singleton
+    return Singleton
+
+def bench_composite_draw():
+    from structural import composition
+    root = composition.CompositeGraphic()
+    for _ in range(10):
+        group = composition.CompositeGraphic()
+        for _ in range(10):
+            group.add(composition.Circle())
+            group.add(composition.Square())
+        root.add(group)
+    return root.draw
+
+def bench_decorator_cost():
+    from structural import decorator
+    coffee = decorator.SimpleCoffee()
+    for i in range(10):
+        coffee = decorator.MilkDecorator(coffee) if i % 2 else decorator.SugarDecorator(coffee)
+    return coffee.cost
+
+def bench_observer_notify():
+    from behavioral import observer
+
+    class NullObserver(observer.Observer):
+        def update(self, message: str):
+            pass
+
+    subject = observer.ConcreteSubject()
+    for _ in range(100):
+        subject.attach(NullObserver())
+    return lambda: subject.notify("tick")
+
+def bench_chain_handle():
+    from behavioral import chainofreponsibility as chain
+    handler = chain.ConcreteHandlerA(chain.ConcreteHandlerB(chain.ConcreteHandlerC()))
+    return lambda: handler.handle(25)
+
+def bench_editor_edit_undo():
+    from behavioral import command
+    editor = command.Editor()
+    invoker = command.EditorInvoker()
+
+    def edit_and_undo():
+        invoker.execute_command(command.WriteCommand(editor, "hello"))
+        invoker.execute_command(command.EraseCommand(editor, 2))
+        invoker.undo_last()
+        invoker.undo_last()
+    return edit_and_undo
+
+def bench_lift_scheduling():
+    from behavioral import state
+    lift = state.Lift(state.LOOKScheduler(), verbose=False)
+    floors = [7, 2, 9, 4, 1, 8, 3]
+
+    def serve():
+        for floor in floors:
+            lift.press_button(floor)
+        while lift.target_floor is not None:
+            lift.arrive(lift.target_floor)
+    return serve
+
+BENCHMARKS = {
+    "factory.get_shape": bench_factory_get_shape,
+    "singleton.new": bench_singleton,
+    "composite.draw": bench_composite_draw,
+    "decorator.cost": bench_decorator_cost,
+    "observer.notify": bench_observer_notify,
+    "chain.handle": bench_chain_handle,
+    "command.edit_undo": bench_editor_edit_undo,
+    "state.lift_scheduling": bench_lift_scheduling,
+}
+
+# Measurement
+def calibrate(operation, min_time):
+    loops = 1
+    while True:
+        if sample(operation, loops) * loops >= min_time:
+            return loops
+        loops *= 2
+
+def sample(operation, loops):
+    """Mean seconds per operation over `loops` calls."""
+    iterations = range(loops)
+    start = time.perf_counter()
+    for _ in iterations:
+        operation()
+    return (time.perf_counter() - start) / loops
+
+def measure(operation, repeat=15, warmup=3, min_time=0.02):
+    with quiet():
+        loops = calibrate(operation, min_time)
+        for _ in range(warmup):
+            sample(operation, loops)
+        samples = [sample(operation, loops) * 1e9 for _ in range(repeat)]
+    quartiles = statistics.quantiles(samples, n=4)
+    return {
+        "loops": loops,
+        "samples_ns": samples,
+        "min_ns": min(samples),
+        "median_ns": statistics.median(samples),
+        "mean_ns": statistics.fmean(samples),
+        "stdev_ns": statistics.stdev(samples),
+        "iqr_ns": quartiles[2] - quartiles[0],
+    }
+
+def run(args):
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+    print(f"{'benchmark':<24} {'median':>12} {'iqr':>10} {'min':>12}")
+    for name, setup in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+        stats = measure(setup(), repeat=args.repeat, warmup=args.warmup, min_time=args.min_time)
+        results["benchmarks"][name] = stats
+        print(f"{name:<24} {stats['median_ns']:>9,.0f} ns {stats['iqr_ns']:>7,.0f} ns {stats['min_ns']:>9,.0f} ns")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)["benchmarks"]
+    with open(args.current) as f:
+        current = json.load(f)["benchmarks"]
+    regressions = []
+    print(f"{'benchmark':<24} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name in sorted(baseline.keys() & current.keys()):
+        before = baseline[name]["median_ns"]
+        after = current[name]["median_ns"]
+        change = after / before - 1
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<24} {before:>9,.0f} ns {after:>9,.0f} ns {change:>+7.1%}{flag}")
+    for name in sorted(baseline.keys() ^ current.keys()):
+        print(f"{name:<24} only in {'baseline' if name in baseline else 'current'}")
+    return 1 if regressions else 0
+
+def _repeat(value):
+    repeat = int(value)
+    if repeat < 2:
+        raise argparse.ArgumentTypeError("need at least 2 samples for the spread statistics")
+    return repeat
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    run_parser.add_argument("-k", "--filter", help="only run benchmarks whose name contains this")
+    run_parser.add_argument("--repeat", type=_repeat, default=15, help="samples per benchmark (at least 2)")
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--min-time", type=float, default=0.02, help="seconds per sample")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="relative slowdown of the median that counts as a regression")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -59,7 +59,7 @@ class EdgeShapeFactory(ShapeFactory):
         if shape_type == "square":
             return Square()
         elif shape_type == "rectangle":
-            return Rectangle())
+            return Rectangle()
         else:
             raise ValueError("Unknown shape type")
 
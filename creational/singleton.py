@@ -54,10 +54,11 @@ class Singleton:
         self.value = None
 
 # Example usage
-singleton1 = Singleton()
-singleton1.value = "First Instance"
+if __name__ == "__main__":
+    singleton1 = Singleton()
+    singleton1.value = "First Instance"
 
-singleton2 = Singleton()
-print(singleton2.value)  # Output: First Instance
+    singleton2 = Singleton()
+    print(singleton2.value)  # Output: First Instance
 
-print(singleton1 is singleton2)  # Output: True
\ No newline at end of file
+    print(singleton1 is singleton2)  # Output: True
\ No newline at end of file
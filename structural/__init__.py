@@ -0,0 +1,17 @@
+'''
+Structural design patterns.
+
+Each submodule is imported the first time it is accessed as an attribute,
+e.g. `structural.proxy`, so importing the package itself is cheap.
+'''
+
+__all__ = ["adapter", "composition", "compositeserialization", "decorator", "facade", "proxy"]
+
+def __getattr__(name):
+    if name in __all__:
+        from importlib import import_module
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,324 @@
+'''
+Compact binary format for Composite Graphic trees
+
+A file is the magic bytes b"CGF1" followed by the tree in pre-order. Every node starts with its type tag as
+an unsigned LEB128 varint; a composite then stores its child count and the byte length of its children's
+encoding, also as varints, followed by the children themselves. The byte length lets a reader skip a whole
+subtree, which is what allows a memory-mapped file to be materialized lazily, one composite at a time.
+
+Usage
+- dump(graphic, f) / load(f) stream to and from binary file objects.
+- load_lazy(path) memory-maps a file and decodes each composite's children only when first accessed.
+- python -m structural.compositeserialization --benchmark compares size and load time with pickle.
+'''
+
+import io
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from .composition import Circle, CompositeGraphic, Graphic, Square
+
+MAGIC = b"CGF1"
+
+# Type tags; register() adds new leaf types.
+COMPOSITE_TAG = 0
+_TAGS = {CompositeGraphic: COMPOSITE_TAG, Circle: 1, Square: 2}
+_LEAVES = {tag: cls for cls, tag in _TAGS.items() if tag != COMPOSITE_TAG}
+
+def register(cls, tag):
+    """Give a leaf Graphic class a tag so it can be serialized."""
+    if tag == COMPOSITE_TAG or tag in _LEAVES:
+        raise ValueError(f"Tag {tag} is already in use")
+    _TAGS[cls] = tag
+    _LEAVES[tag] = cls
+
+_SMALL_VARINTS = [bytes((value,)) for value in range(0x80)]
+
+def _varint(value):
+    if value < 0x80:
+        return _SMALL_VARINTS[value]
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def _varint_size(value):
+    return max(1, (value.bit_length() + 6) // 7)
+
+def _decode_varint(buffer, position):
+    value = buffer[position]
+    if value < 0x80:
+        return value, position + 1
+    value &= 0x7F
+    shift = 7
+    while True:
+        position += 1
+        byte = buffer[position]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position + 1
+        shift += 7
+
+def _tag(graphic):
+    # Looked up by exact type: isinstance() against the Graphic ABC is slow
+    # enough to dominate encoding.
+    cls = type(graphic)
+    tag = _TAGS.get(cls)
+    if tag is None:
+        if not issubclass(cls, CompositeGraphic):
+            raise TypeError(f"No tag registered for {cls.__name__}")
+        tag = _TAGS[cls] = COMPOSITE_TAG
+    return tag
+
+# Writing
+def _body_lengths(root):
+    """Byte length of each composite's children encoding, keyed by id(), computed bottom-up."""
+    lengths = {}
+    stack = [(root, False)] if _tag(root) == COMPOSITE_TAG else []
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node._children if _tag(child) == COMPOSITE_TAG)
+            continue
+        total = 0
+        for child in node._children:
+            tag = _tag(child)
+            if tag == COMPOSITE_TAG:
+                body = lengths[id(child)]
+                total += 1 + _varint_size(len(child._children)) + _varint_size(body) + body
+            else:
+                total += 1 if tag < 0x80 else _varint_size(tag)
+        lengths[id(node)] = total
+    return lengths
+
+def dump(graphic: Graphic, f, buffer_size=1 << 16):
+    """Write `graphic` to the binary file object `f`, flushing every `buffer_size` bytes."""
+    lengths = _body_lengths(graphic)
+    out = bytearray(MAGIC)
+    stack = [graphic]
+    while stack:
+        node = stack.pop()
+        tag = _tag(node)
+        out += _varint(tag)
+        if tag == COMPOSITE_TAG:
+            children = node._children
+            out += _varint(len(children))
+            out += _varint(lengths[id(node)])
+            stack.extend(reversed(children))
+        if len(out) >= buffer_size:
+            f.write(out)
+            out.clear()
+    f.write(out)
+
+def dumps(graphic: Graphic):
+    f = io.BytesIO()
+    dump(graphic, f)
+    return f.getvalue()
+
+# Reading
+def _build(data, position, refill):
+    """
+    Decode one tree from `data` starting at `position`. `refill(data, position)`
+    is called when fewer than 32 bytes remain and returns a (data, position)
+    pair with more input appended.
+    """
+    try:
+        return _build_tree(data, position, refill)
+    except IndexError:  # the input ended in the middle of a node
+        raise EOFError("Truncated graphic stream") from None
+
+def _build_tree(data, position, refill):
+    root = None
+    stack = []  # [composite, children still to read]
+    leaves = _LEAVES
+    while True:
+        if len(data) - position < 32:
+            data, position = refill(data, position)
+        tag = data[position]
+        if tag < 0x80:
+            position += 1
+        else:
+            tag, position = _decode_varint(data, position)
+        if tag == COMPOSITE_TAG:
+            count, position = _decode_varint(data, position)
+            _, position = _decode_varint(data, position)  # body length, only needed to skip subtrees
+            node = CompositeGraphic()
+        else:
+            count = 0
+            node = leaves[tag]()
+        if stack:
+            top = stack[-1]
+            top[0]._children.append(node)
+            top[1] -= 1
+        else:
+            root = node
+        if count:
+            stack.append([node, count])
+        else:
+            while stack and stack[-1][1] == 0:
+                stack.pop()
+        if not stack:
+            return root
+
+def load(f, block_size=1 << 16) -> Graphic:
+    """Read a graphic written by dump() from the binary file object `f`, `block_size` bytes at a time."""
+    def refill(data, position):
+        more = f.read(block_size)
+        if not more and position >= len(data):
+            raise EOFError("Truncated graphic stream")
+        return data[position:] + more, 0
+
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a composite graphic file")
+    return _build(b"", 0, refill)
+
+def loads(data) -> Graphic:
+    def refill(data, position):
+        if position >= len(data):
+            raise EOFError("Truncated graphic stream")
+        return data, position
+
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a composite graphic file")
+    return _build(data, len(MAGIC), refill)
+
+# Lazy, memory-mapped reading
+class LazyCompositeGraphic(CompositeGraphic):
+    """Composite whose children are decoded from a mapped buffer on first access."""
+
+    def __init__(self, buffer, offset, count):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+        self._loaded = None
+
+    @property
+    def _children(self):
+        if self._loaded is None:
+            self._loaded = self._decode_children()
+        return self._loaded
+
+    @_children.setter
+    def _children(self, children):
+        self._loaded = children
+
+    def _decode_children(self):
+        try:
+            return self._decode_children_from_buffer()
+        except IndexError:
+            raise EOFError("Truncated graphic stream") from None
+
+    def _decode_children_from_buffer(self):
+        buffer = self._buffer
+        position = self._offset
+        children = []
+        for _ in range(self._count):
+            tag, position = _decode_varint(buffer, position)
+            if tag == COMPOSITE_TAG:
+                count, position = _decode_varint(buffer, position)
+                length, position = _decode_varint(buffer, position)
+                children.append(LazyCompositeGraphic(buffer, position, count))
+                position += length
+            else:
+                children.append(_LEAVES[tag]())
+        return children
+
+def load_lazy(path) -> Graphic:
+    """Memory-map `path` read-only and return its root without decoding any children yet."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < len(MAGIC):  # mmap refuses empty files
+            raise ValueError("Not a composite graphic file")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a composite graphic file")
+    try:
+        tag, position = _decode_varint(buffer, len(MAGIC))
+        if tag != COMPOSITE_TAG:
+            return _LEAVES[tag]()
+        count, position = _decode_varint(buffer, position)
+        _, position = _decode_varint(buffer, position)
+    except IndexError:
+        raise EOFError("Truncated graphic stream") from None
+    return LazyCompositeGraphic(buffer, position, count)
+
+# Benchmark against pickle
+def _scene(fanout, depth):
+    root = CompositeGraphic()
+    level = [root]
+    for current_depth in range(depth):
+        next_level = []
+        for composite in level:
+            for i in range(fanout):
+                if current_depth == depth - 1:
+                    composite.add(Circle() if i % 2 else Square())
+                else:
+                    child = CompositeGraphic()
+                    composite.add(child)
+                    next_level.append(child)
+        level = next_level
+    return root
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def benchmark(fanout=10, depth=5):
+    scene = _scene(fanout, depth)
+    with tempfile.TemporaryDirectory() as workdir:
+        binary_path = os.path.join(workdir, "scene.cgf")
+        pickle_path = os.path.join(workdir, "scene.pickle")
+
+        with open(binary_path, "wb") as f:
+            _, binary_save = _timed(dump, scene, f)
+        with open(pickle_path, "wb") as f:
+            _, pickle_save = _timed(pickle.dump, scene, f, pickle.HIGHEST_PROTOCOL)
+
+        with open(binary_path, "rb") as f:
+            _, binary_load = _timed(load, f)
+        with open(pickle_path, "rb") as f:
+            _, pickle_load = _timed(pickle.load, f)
+        lazy_root, lazy_open = _timed(load_lazy, binary_path)
+        _, lazy_subtree = _timed(lambda: len(lazy_root._children[0]._children[0]._children))
+
+        print(f"Scene: fanout {fanout}, depth {depth}")
+        print(f"{'format':>14} {'size (bytes)':>14} {'save (ms)':>10} {'load (ms)':>10}")
+        print(f"{'pickle':>14} {os.path.getsize(pickle_path):>14,} {pickle_save * 1000:>10.1f} "
+              f"{pickle_load * 1000:>10.1f}")
+        print(f"{'binary':>14} {os.path.getsize(binary_path):>14,} {binary_save * 1000:>10.1f} "
+              f"{binary_load * 1000:>10.1f}")
+        print(f"{'binary (mmap)':>14} {'':>14} {'':>10} {lazy_open * 1000:>10.3f}"
+              f"  (+{lazy_subtree * 1000:.3f} ms to open one subtree)")
+
+# Usage
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--benchmark"]:
+        benchmark()
+        sys.exit()
+
+    scene = CompositeGraphic()
+    group = CompositeGraphic()
+    group.add(Circle())
+    group.add(Square())
+    scene.add(group)
+    scene.add(Circle())
+
+    data = dumps(scene)
+    print(f"Encoded scene in {len(data)} bytes: {data.hex(' ')}")
+    print("Drawing decoded scene:")
+    loads(data).draw()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "scene.cgf")
+        with open(path, "wb") as f:
+            dump(scene, f)
+        print("Drawing memory-mapped scene:")
+        lazy_scene = load_lazy(path)
+        lazy_scene.draw()
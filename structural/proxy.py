@@ -22,6 +22,11 @@ Uses
 '''
 
 
+import hashlib
+import json
+import os
+import tempfile
+import time
 from abc import ABC, abstractmethod
 
 # Subject Interface
@@ -38,31 +43,182 @@ class RealImage(Image):
 
     def _load_from_disk(self):
         print(f"Loading image from disk: {self.filename}")
+        with open(self.filename, "rb") as f:
+            self.data = f.read()
 
     def display(self):
         print(f"Displaying image: {self.filename}")
 
+def _file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# On-disk cache of derived images
+class DerivativeCache:
+    """
+    Content-addressed store for derived forms of images, shared between processes.
+
+    Keys hash the source file's bytes together with the transform name and
+    parameters, so an edited source or a different parameter never hits a
+    stale entry. Entries are written to a temporary file and renamed into
+    place, so readers never see a partial entry. Each hit refreshes the
+    entry's mtime, and gc() deletes the least recently used entries once the
+    cache grows past max_bytes; it runs when a cache is opened and after every
+    max_bytes / 8 written, so short-lived processes collect too. Source digests are memoized in the cache too,
+    keyed by path, size and mtime, so a warm start does not rehash the source.
+    """
+
+    def __init__(self, directory, max_bytes=256 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._written_since_gc = 0
+        self.gc()
+
+    @staticmethod
+    def key(source_digest, transform_name, params):
+        description = json.dumps([source_digest, transform_name, params], sort_keys=True)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:  # never written, or collected by another process
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # collected after we read it; the data is still good
+            pass
+        return data
+
+    def source_digest(self, path):
+        """SHA-256 of the file at `path`, rehashed only when its size or mtime changes."""
+        stat = os.stat(path)
+        key = self.key(os.path.abspath(path), "source_digest", [stat.st_size, stat.st_mtime_ns])
+        digest = self.get(key)
+        if digest is None:
+            digest = _file_digest(path).encode()
+            self.put(key, digest)
+        return digest.decode()
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._written_since_gc += len(data)
+        if self._written_since_gc > self.max_bytes // 8:
+            self.gc()
+
+    def gc(self, stale_temp_seconds=3600):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        self._written_since_gc = 0
+        entries = []
+        now = time.time()
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    if name.startswith(".tmp-"):
+                        # Another process may still be writing it.
+                        if now - stat.st_mtime > stale_temp_seconds:
+                            os.unlink(path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
 # Proxy
 class ProxyImage(Image):
-    def __init__(self, filename):
+    def __init__(self, filename, cache: DerivativeCache = None):
         self.filename = filename
+        self.cache = cache
         self._real_image = None
+        self._source_digest = None
+        self._source_stat = None
 
-    def display(self):
+    def _get_real_image(self):
         if self._real_image is None:
             self._real_image = RealImage(self.filename)
+        return self._real_image
+
+    def display(self):
+        real_image = self._get_real_image()
         print("Proxy: Delegating display to RealImage.")
-        self._real_image.display()
+        real_image.display()
+
+    def source_digest(self):
+        # Checked on every call so an edited source is never served stale derivatives.
+        stat = os.stat(self.filename)
+        if (stat.st_size, stat.st_mtime_ns) != self._source_stat:
+            self._source_stat = (stat.st_size, stat.st_mtime_ns)
+            self._real_image = None
+            if self.cache is None:
+                self._source_digest = _file_digest(self.filename)
+            else:
+                self._source_digest = self.cache.source_digest(self.filename)
+        return self._source_digest
+
+    def derivative(self, name, transform, **params):
+        """
+        Return transform(real_image, **params) as bytes, computed at most once
+        per source content and parameters across processes and restarts.
+        """
+        if self.cache is None:
+            return transform(self._get_real_image(), **params)
+        key = self.cache.key(self.source_digest(), name, params)
+        data = self.cache.get(key)
+        if data is None:
+            data = transform(self._get_real_image(), **params)
+            self.cache.put(key, data)
+        return data
 
 # Client code
 if __name__ == "__main__":
-    print("Creating proxy_image1...")
-    proxy_image1 = ProxyImage("photo1.jpg")
-    print("First display call:")
-    proxy_image1.display()  # Loads and displays
-    print("\nSecond display call:")
-    proxy_image1.display()  # Only displays
-
-    print("\nCreating proxy_image2...")
-    proxy_image2 = ProxyImage("photo2.png")
-    proxy_image2.display()
\ No newline at end of file
+    with tempfile.TemporaryDirectory() as workdir:
+        for filename in ("photo1.jpg", "photo2.png"):
+            with open(os.path.join(workdir, filename), "wb") as f:
+                f.write(os.urandom(4096))
+
+        print("Creating proxy_image1...")
+        proxy_image1 = ProxyImage(os.path.join(workdir, "photo1.jpg"))
+        print("First display call:")
+        proxy_image1.display()  # Loads and displays
+        print("\nSecond display call:")
+        proxy_image1.display()  # Only displays
+
+        print("\nCreating proxy_image2...")
+        proxy_image2 = ProxyImage(os.path.join(workdir, "photo2.png"))
+        proxy_image2.display()
+
+        def thumbnail(image, width):
+            return image.data[::max(1, len(image.data) // width)]
+
+        cache = DerivativeCache(os.path.join(workdir, "cache"))
+        print("\nCold cache:")
+        ProxyImage(proxy_image2.filename, cache).derivative("thumbnail", thumbnail, width=64)  # Loads
+        print("Warm cache (as after a restart):")
+        ProxyImage(proxy_image2.filename, cache).derivative("thumbnail", thumbnail, width=64)  # No load
\ No newline at end of file